@@ -106,15 +106,24 @@ def main() -> None:
             if not ret:
                 print("Failed to grab frame from camera.")
                 exit(1)
-            img_draw = image
+        assert image is not None
+
+        # A single cv2.flip() returns a new image to draw on. Without a flip, the still image from a recording is
+        # reused for every frame and must be copied, while a camera frame can be drawn on directly.
+        if _state["flip_horizontal"] and _state["flip_vertical"]:
+            flip_code = -1
+        elif _state["flip_vertical"]:
+            flip_code = 0
+        elif _state["flip_horizontal"]:
+            flip_code = 1
         else:
-            assert image is not None
+            flip_code = None
+        if flip_code is not None:
+            img_draw = cv2.flip(image, flip_code)
+        elif cap is None:
             img_draw = image.copy()
-
-        if _state["flip_horizontal"]:
-            img_draw = cv2.flip(img_draw, 1)
-        if _state["flip_vertical"]:
-            img_draw = cv2.flip(img_draw, 0)
+        else:
+            img_draw = image
 
         utils.add_text_to_image(img_draw, text)
         cv2.imshow("Keyboard View", img_draw)
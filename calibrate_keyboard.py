@@ -98,16 +98,10 @@ def find_closest_point_index(x: int, y: int, points: list[tuple[int, int]], max_
     if not points:
         return -1
 
-    closest_idx = -1
-    min_dist = float("inf")
-
-    for i, point in enumerate(points):
-        dist = np.sqrt((point[0] - x) ** 2 + (point[1] - y) ** 2)
-        if dist < min_dist and dist <= max_distance:
-            min_dist = dist
-            closest_idx = i
-
-    return closest_idx
+    diff = np.asarray(points, dtype=np.float64) - (x, y)
+    dist_sq = (diff * diff).sum(axis=1)
+    closest_idx = int(np.argmin(dist_sq))
+    return closest_idx if dist_sq[closest_idx] <= max_distance**2 else -1
 
 
 def mouse_callback(event: int, x: int, y: int, _flags: int, _param: object) -> None:
@@ -208,7 +202,7 @@ def main(recording: str | None = None, live: int | None = None) -> None:
             assert image is not None
             img_draw = image.copy()
 
-        img_draw = utils.flip_image(img_draw)
+        img_draw = utils.flip_image(img_draw, in_place=cap is None)
 
         draw_points(img_draw, _state["user_defined_points"])
 
@@ -216,8 +210,8 @@ def main(recording: str | None = None, live: int | None = None) -> None:
         if len(_state["user_defined_points"]) < 4:
             draw_trapezoid(img_draw, _state["user_defined_points"])
         elif len(_state["user_defined_points"]) == 4:
+            # Also assigns the object coordinates of the four corners (via get_correspondences_without_projection)
             draw_trapezoid(img_draw, _state["user_defined_points"])
-            get_correspondences_without_projection(_state["user_defined_points"])
             draw_keys_3d.re_init(_state["user_defined_points"])
             draw_keys_3d.draw_keyboard(img_draw, (0, 200, 0))
         elif len(_state["user_defined_points"]) > 4:
@@ -247,19 +241,16 @@ def main(recording: str | None = None, live: int | None = None) -> None:
 
 
 def find_closest_point(pt: CorrespondingPoints) -> tuple[float, float]:
-    min_distance = float("inf")
-    closest_pitch, closest_index = None, None
-    for pitch in range(21, 109):
-        key_pts = draw_keys_3d.pixel_coordinates_of_key(pitch)
-        # Find the closest point in this key's points
-        for idx, key_pt in enumerate(key_pts):
-            distance = np.linalg.norm(np.array(key_pt) - np.array(pt["pixel"]))
-            if distance < min_distance:
-                min_distance = distance
-                # closest = key_pt
-                closest_pitch = pitch
-                closest_index = idx  # Store the index
-    assert closest_pitch is not None and closest_index is not None, f"Could not find closest pitch for point {pt}"
+    # Stack the corners of all keys and remember which pitch and corner index each row belongs to
+    key_pts = [draw_keys_3d.pixel_coordinates_of_key(pitch)[:, 0, :] for pitch in range(21, 109)]
+    pitches = np.repeat(np.arange(21, 109), [len(p) for p in key_pts])
+    indices = np.concatenate([np.arange(len(p)) for p in key_pts])
+    all_pts = np.concatenate(key_pts)
+
+    # Squared distances are sufficient to find the closest corner
+    diff = all_pts - np.asarray(pt["pixel"], dtype=np.float32)
+    closest = int(np.argmin((diff * diff).sum(axis=1)))
+    closest_pitch, closest_index = int(pitches[closest]), int(indices[closest])
 
     object_coords = keyboard_geometry.key_points(closest_pitch)[closest_index]
 
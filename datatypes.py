@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field
 from typing import Any, Literal, TypedDict
 
+import numpy as np
 import numpy.typing as npt
 
 HandLiteral = Literal["left", "right", ""]
@@ -21,12 +22,18 @@ class CorrespondingPoints(TypedDict):
     object: tuple[float, float] | None
 
 
+def _no_landmarks() -> npt.NDArray[np.float32]:
+    return np.zeros((0, 3), dtype=np.float32)
+
+
 @dataclass
 class TrackingResult:
+    """Hand tracking result. Landmarks are (21, 3) float32 arrays of normalized x, y, z per MediaPipe landmark."""
+
     left_visible: bool = False
     right_visible: bool = False
-    left_landmarks_xyz: tuple[list[float], list[float], list[float]] = field(default_factory=lambda: ([], [], []))
-    right_landmarks_xyz: tuple[list[float], list[float], list[float]] = field(default_factory=lambda: ([], [], []))
+    left_landmarks_xyz: npt.NDArray[np.float32] = field(default_factory=_no_landmarks)
+    right_landmarks_xyz: npt.NDArray[np.float32] = field(default_factory=_no_landmarks)
 
 
 Image = npt.NDArray[Any]
@@ -1,7 +1,8 @@
 """Draw piano keys in 3D perspective on an image using homography."""
 
+import functools
+import itertools
 import json
-import os
 
 import cv2
 import numpy as np
@@ -11,12 +12,35 @@ import utils
 from datatypes import CorrespondingPoints, Image
 
 homography_matrix = None  # Homography matrix
+# Pixel coordinates of key outlines (float and rounded for drawing) and key bounding boxes by MIDI pitch,
+# cleared by re_init()
+_key_outline_cache: dict[int, Image] = {}
+_key_contour_cache: dict[int, Image] = {}
+_key_bounding_box_cache: dict[int, Image] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _keyboard_outline_contour() -> Image:
+    """Outline of the whole keyboard rounded to integer pixel coordinates. Cached until the next re_init()."""
+    ps = keyboard_geometry.KEYBOARD_OUTLINE
+    points = [
+        ps["top-left"],
+        ps["top-right"],
+        ps["bottom-right"],
+        ps["bottom-left"],
+    ]
+    assert homography_matrix is not None, "Homography matrix not initialized. Call init() first."
+    points_2d = np.array(points, dtype=np.float32).reshape(-1, 1, 2)
+    contour = np.round(cv2.perspectiveTransform(points_2d, homography_matrix)).astype(np.int32)
+    contour.flags.writeable = False
+    return contour
 
 
 def re_init(keypoint_mappings_param: list[CorrespondingPoints] | None = None) -> None:
     """
     Initialize global calibration variables by performing 3D calibration.
     If no keypoint mappings are provided, it will load them from a file.
+    Also call this after keyboard_geometry.re_init(), so that cached key outlines are recomputed.
 
     Args:
         keypoint_mappings (list): A list of dictionaries containing
@@ -57,35 +81,67 @@ def re_init(keypoint_mappings_param: list[CorrespondingPoints] | None = None) ->
 
     # Calculate homography with RANSAC for robustness
     homography_matrix, _ = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
+    _key_outline_cache.clear()
+    _key_contour_cache.clear()
+    _key_bounding_box_cache.clear()
+    _keyboard_outline_contour.cache_clear()
 
 
 re_init()  # Call this again if the calibration has changed and you want to update the homography matrix.
 
 
-def _draw_polygon(img: Image, points: Image, color: tuple[int, int, int]) -> None:
-    img_points = np.round(points).astype(np.int32)
-    img_points = img_points.reshape((-1, 1, 2))
-    cv2.polylines(img, [img_points], isClosed=True, color=color, thickness=1)
-
-
-def pixel_coordinates_of_key(midi_pitch: int) -> Image:
-    """Projects the 3D coordinates of a key onto the 2D image plane to get the pixel coordinates."""
-    points = keyboard_geometry.key_points(midi_pitch)
+def _project_all_keys() -> None:
+    """Projects the outlines and bounding boxes of all 88 keys with a single perspectiveTransform and fills the
+    caches with views."""
     assert homography_matrix is not None, "Homography matrix not initialized. Call init() first."
+    pitches = range(21, 109)
+    outlines = [keyboard_geometry.key_points(pitch) for pitch in pitches]
+    boxes = [keyboard_geometry.key_bounding_box(pitch) for pitch in pitches]
     # For homography we need 2D points in the form (n,1,2)
-    points_2d = np.array(points, dtype=np.float32).reshape(-1, 1, 2)
+    all_points = [point for polygon in outlines + boxes for point in polygon]
+    points_2d = np.array(all_points, dtype=np.float32).reshape(-1, 1, 2)
     image_points = cv2.perspectiveTransform(points_2d, homography_matrix)
-    return image_points
+    image_points.flags.writeable = False
+    contours = np.round(image_points).astype(np.int32)
+    contours.flags.writeable = False
+
+    start = 0
+    for pitch, polygon in zip(pitches, outlines):
+        end = start + len(polygon)
+        _key_outline_cache[pitch] = image_points[start:end]
+        _key_contour_cache[pitch] = contours[start:end]
+        start = end
+    for pitch, polygon in zip(pitches, boxes):
+        end = start + len(polygon)
+        _key_bounding_box_cache[pitch] = image_points[start:end]
+        start = end
+
+
+def pixel_coordinates_of_key(midi_pitch: int) -> Image:
+    """Projects the 3D coordinates of a key onto the 2D image plane to get the pixel coordinates.
+
+    The result is cached until the next re_init() and must not be modified.
+    """
+    if not _key_outline_cache:
+        _project_all_keys()
+    return _key_outline_cache[midi_pitch]
+
+
+def _key_contour(midi_pitch: int) -> Image:
+    """Key outline rounded to integer pixel coordinates for drawing. Cached like pixel_coordinates_of_key()."""
+    if not _key_contour_cache:
+        _project_all_keys()
+    return _key_contour_cache[midi_pitch]
 
 
 def pixel_coordinates_of_bounding_box(midi_pitch: int) -> Image:
-    """Projects the 3D coordinates of a key's bounding box onto the 2D image plane to get the pixel coordinates."""
-    points = keyboard_geometry.key_bounding_box(midi_pitch)
-    assert homography_matrix is not None, "Homography matrix not initialized. Call init() first."
-    # For homography we need 2D points in the form (n,1,2)
-    points_2d = np.array(points, dtype=np.float32).reshape(-1, 1, 2)
-    image_points = cv2.perspectiveTransform(points_2d, homography_matrix)
-    return image_points
+    """Projects the 3D coordinates of a key's bounding box onto the 2D image plane to get the pixel coordinates.
+
+    The result is cached until the next re_init() and must not be modified.
+    """
+    if not _key_bounding_box_cache:
+        _project_all_keys()
+    return _key_bounding_box_cache[midi_pitch]
 
 
 def draw_key(
@@ -94,32 +150,43 @@ def draw_key(
     color: tuple[int, int, int],
     annotation: str = "",
 ) -> Image:
-    image_points = pixel_coordinates_of_key(midi_pitch)
-    _draw_polygon(img, image_points, color)
-    draw_annotation(img, midi_pitch, color, annotation, image_points)
+    cv2.polylines(img, [_key_contour(midi_pitch)], isClosed=True, color=color, thickness=1)
+    draw_annotation(img, midi_pitch, color, annotation, pixel_coordinates_of_key(midi_pitch))
+    return img
+
+
+def draw_keys(img: Image, keys: list[tuple[int, tuple[int, int, int], str]]) -> Image:
+    """Draw several keys given as (midi_pitch, color, annotation), with one polylines call per run of consecutive
+    keys with the same color. Keeping the order matters where adjacent keys of different colors share an edge:
+    the key drawn last wins, as with calling draw_key() for each key."""
+    for color, run in itertools.groupby(keys, key=lambda key: key[1]):
+        run = list(run)
+        cv2.polylines(
+            img, [_key_contour(midi_pitch) for midi_pitch, _, _ in run], isClosed=True, color=color, thickness=1
+        )
+        for midi_pitch, _, annotation in run:
+            draw_annotation(img, midi_pitch, color, annotation, pixel_coordinates_of_key(midi_pitch))
     return img
 
 
 def draw_keyboard(img: Image, color: tuple[int, int, int], outline_only: bool = False) -> Image:
     if outline_only:
-        ps = keyboard_geometry.KEYBOARD_OUTLINE
-        points = [
-            ps["top-left"],
-            ps["top-right"],
-            ps["bottom-right"],
-            ps["bottom-left"],
-        ]
-        assert homography_matrix is not None, "Homography matrix not initialized. Call init() first."
-        points_2d = np.array(points, dtype=np.float32).reshape(-1, 1, 2)
-        image_points = cv2.perspectiveTransform(points_2d, homography_matrix)
-        _draw_polygon(img, image_points, color)
+        cv2.polylines(img, [_keyboard_outline_contour()], isClosed=True, color=color, thickness=1)
         return img
     else:
-        for midi_pitch in range(21, 109):
-            draw_key(img, midi_pitch, color)
+        # Draw all key outlines with a single polylines call
+        contours = [_key_contour(midi_pitch) for midi_pitch in range(21, 109)]
+        cv2.polylines(img, contours, isClosed=True, color=color, thickness=1)
         return img
 
 
+@functools.lru_cache(maxsize=256)
+def _annotation_size(annotation: str) -> tuple[int, int]:
+    """Width and height of an annotation in pixels. Cached, as only a few distinct annotations occur."""
+    (text_width, text_height), _ = cv2.getTextSize(annotation, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+    return text_width, text_height
+
+
 def draw_annotation(
     img: Image,
     midi_pitch: int,
@@ -133,7 +200,7 @@ def draw_annotation(
         else:
             y_offset = 10
 
-        (text_width, text_height), _ = cv2.getTextSize(annotation, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+        text_width, text_height = _annotation_size(annotation)
 
         # Find minimum and maximum x-value
         x_values = [point[0][0] for point in image_points]
@@ -165,13 +232,7 @@ def draw_annotation(
 
 
 def main() -> None:
-    image_path = utils.get_keyboard_image_file_path()
-    img = None
-    if os.path.exists(image_path):
-        img = cv2.imread(image_path)
-    if img is None:
-        img = np.full((1080, 1920, 3), 255, dtype=np.uint8)
-    img = utils.flip_image(img)
+    img = utils.load_keyboard_image()
 
     for midi_pitch in range(21, 109):
         draw_key(img, midi_pitch, (0, 200, 0), f"{midi_pitch}")
@@ -1,6 +1,8 @@
 """Defines the geometry of a standard 88-key piano keyboard in millimeters.
 Includes functions to get key point coordinates and bounding boxes for a given pitch."""
 
+import functools
+import itertools
 import json
 import os
 from typing import Final
@@ -72,11 +74,29 @@ KEYBOARD_OUTLINE: Final[dict[str, tuple[float, float]]] = {
 }
 
 
-def pitch_class(midi_pitch: int) -> str:
-    c = midi_pitch % 12
-    pitch_classes = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-    return pitch_classes[c]
+PITCH_CLASSES: Final[tuple[str, ...]] = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+
 
+def pitch_class(midi_pitch: int) -> str:
+    return PITCH_CLASSES[midi_pitch % 12]
+
+
+# Width of the top part of each key by pitch class
+_TOP_WIDTHS: Final[dict[str, float]] = {
+    "C": C_TOP_WIDTH,
+    "C#": BLACK_WIDTH,
+    "D": D_TOP_WIDTH,
+    "D#": BLACK_WIDTH,
+    "E": E_TOP_WIDTH,
+    "F": F_TOP_WIDTH,
+    "F#": BLACK_WIDTH,
+    "G": G_TOP_WIDTH,
+    "G#": BLACK_WIDTH,
+    "A": A_TOP_WIDTH,
+    "A#": BLACK_WIDTH,
+    "B": B_TOP_WIDTH,
+}
+_WHITE_KEY_INDEX: Final[dict[int, int]] = {pitch: i for i, pitch in enumerate(WHITE_KEYS)}
 
 left_at_top: list[float] = []
 right_at_bottom: list[float] = []
@@ -85,91 +105,37 @@ right_at_top: list[float] = []
 
 def re_init() -> None:
     global left_at_bottom, left_at_top, right_at_bottom, right_at_top
-    left_at_top = [0.0]
-    for pitch in range(21, 108):
-        if pitch == 21:
-            left_at_top.append(left_at_top[-1] + LOWER_A_TOP_WIDTH)
-        else:
-            match pitch_class(pitch):
-                case "C":
-                    left_at_top.append(left_at_top[-1] + C_TOP_WIDTH)
-                case "C#":
-                    left_at_top.append(left_at_top[-1] + BLACK_WIDTH)
-                case "D":
-                    left_at_top.append(left_at_top[-1] + D_TOP_WIDTH)
-                case "D#":
-                    left_at_top.append(left_at_top[-1] + BLACK_WIDTH)
-                case "E":
-                    left_at_top.append(left_at_top[-1] + E_TOP_WIDTH)
-                case "F":
-                    left_at_top.append(left_at_top[-1] + F_TOP_WIDTH)
-                case "F#":
-                    left_at_top.append(left_at_top[-1] + BLACK_WIDTH)
-                case "G":
-                    left_at_top.append(left_at_top[-1] + G_TOP_WIDTH)
-                case "G#":
-                    left_at_top.append(left_at_top[-1] + BLACK_WIDTH)
-                case "A":
-                    left_at_top.append(left_at_top[-1] + A_TOP_WIDTH)
-                case "A#":
-                    left_at_top.append(left_at_top[-1] + BLACK_WIDTH)
-                case "B":
-                    left_at_top.append(left_at_top[-1] + B_TOP_WIDTH)
-                case _:
-                    assert False, f"Unexpected pitch class for midi pitch {pitch}"
-
-    left_at_bottom = []
-    for i, pitch in enumerate(range(21, 109)):
-        if pitch in WHITE_KEYS:
-            white_idx = WHITE_KEYS.index(pitch)
-            left_at_bottom.append(white_idx * WHITE_BOTTOM_WIDTH)
-        else:
-            left_at_bottom.append(left_at_top[i])
-
-    right_at_top = left_at_top.copy()
-    for i, pitch in enumerate(range(21, 109)):
-        if pitch == 21:
-            right_at_top[i] += LOWER_A_TOP_WIDTH
-        elif pitch == 108:
-            right_at_top[i] += WHITE_BOTTOM_WIDTH
-        elif pitch not in WHITE_KEYS:
-            right_at_top[i] += BLACK_WIDTH
-        else:
-            match pitch_class(pitch):
-                case "C":
-                    right_at_top[i] += C_TOP_WIDTH
-                case "D":
-                    right_at_top[i] += D_TOP_WIDTH
-                case "E":
-                    right_at_top[i] += E_TOP_WIDTH
-                case "F":
-                    right_at_top[i] += F_TOP_WIDTH
-                case "G":
-                    right_at_top[i] += G_TOP_WIDTH
-                case "A":
-                    right_at_top[i] += A_TOP_WIDTH
-                case "B":
-                    right_at_top[i] += B_TOP_WIDTH
-                case _:
-                    assert False, f"Unexpected pitch class for white key"
-
-    right_at_bottom = left_at_bottom.copy()
-    for i, pitch in enumerate(range(21, 109)):
-        if pitch in WHITE_KEYS:
-            right_at_bottom[i] += WHITE_BOTTOM_WIDTH
-        else:
-            right_at_bottom[i] += BLACK_WIDTH
+    pitches = range(21, 109)
+    top_widths = [_TOP_WIDTHS[pitch_class(pitch)] for pitch in pitches]
+    top_widths[0] = LOWER_A_TOP_WIDTH  # Lowest A has no black key to its left
+    top_widths[-1] = WHITE_BOTTOM_WIDTH  # Highest C has no black key to its right
+
+    left_at_top = list(itertools.accumulate(top_widths[:-1], initial=0.0))
+    right_at_top = [left + width for left, width in zip(left_at_top, top_widths)]
+
+    left_at_bottom = [
+        _WHITE_KEY_INDEX[pitch] * WHITE_BOTTOM_WIDTH if pitch in _WHITE_KEY_INDEX else left
+        for pitch, left in zip(pitches, left_at_top)
+    ]
+    right_at_bottom = [
+        left + (WHITE_BOTTOM_WIDTH if pitch in _WHITE_KEY_INDEX else BLACK_WIDTH)
+        for pitch, left in zip(pitches, left_at_bottom)
+    ]
 
     assert len(left_at_top) == 88
     assert len(left_at_bottom) == 88
     assert len(right_at_top) == 88
     assert len(right_at_bottom) == 88
 
+    key_points.cache_clear()
 
-def key_points(midi_pitch: int) -> list[tuple[float, float]]:
+
+@functools.lru_cache(maxsize=128)
+def key_points(midi_pitch: int) -> tuple[tuple[float, float], ...]:
+    """Corner points of a key in millimeters. Cached until the next re_init()."""
     idx = midi_pitch - 21
     if midi_pitch in WHITE_KEYS:
-        return [
+        return (
             (left_at_top[idx], 0),  # top-left
             (left_at_top[idx], black_height),  # left-middle 1/2
             (left_at_bottom[idx], black_height),  # left-middle 2/2
@@ -178,19 +144,19 @@ def key_points(midi_pitch: int) -> list[tuple[float, float]]:
             (right_at_bottom[idx], black_height),  # right-middle 1/2
             (right_at_top[idx], black_height),  # right-middle 2/2
             (right_at_top[idx], 0),  # top-right
-        ]
+        )
     else:
-        return [
+        return (
             (left_at_top[idx], 0),  # top-left
             (left_at_top[idx], black_height),  # left-middle
             (right_at_top[idx], black_height),  # right-middle
             (right_at_top[idx], 0),  # top-right
-        ]
+        )
 
 
 def key_bounding_box(midi_pitch: int) -> list[tuple[float, float]]:
     if midi_pitch not in WHITE_KEYS:
-        return key_points(midi_pitch)
+        return list(key_points(midi_pitch))
     else:
         idx = WHITE_KEYS.index(midi_pitch)
         left = idx * WHITE_BOTTOM_WIDTH
@@ -1,4 +1,5 @@
 import argparse
+import queue
 import threading
 import time
 
@@ -6,6 +7,7 @@ import cv2
 import mido
 
 import osc_sender
+import track_hands
 from datatypes import Image, MidiResult
 from processing_hub import hub
 
@@ -99,6 +101,8 @@ class VideoProcessor:
         self.cap = None
         self.frame_count = 0
         self.display_window_name = "Video Processing"
+        self.capture_thread = None
+        self.frames: queue.Queue[Image | None] = queue.Queue(maxsize=1)  # Newest captured frame, None at the end
 
     def start_processing(self) -> None:
         """Start processing video."""
@@ -117,20 +121,49 @@ class VideoProcessor:
 
         self.processing = True
         self.frame_count = 0
+
+        # Capture the next frame while the current one is processed. A fresh queue, so that the end marker (None) of a
+        # previous session cannot stop this one.
+        self.frames = queue.Queue(maxsize=1)
+        self.capture_thread = threading.Thread(target=self._capture_callback)
+        self.capture_thread.daemon = True
+        self.capture_thread.start()
+
         print("Video processing started")
 
+    def _capture_callback(self) -> None:
+        """Thread function to read frames from the camera.
+
+        Only the newest frame is kept, so frames are dropped instead of piling up if processing is slower than the
+        camera.
+        """
+        assert self.cap is not None
+        while self.processing:
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            self._put_newest(frame)
+        self._put_newest(None)
+
+    def _put_newest(self, frame: Image | None) -> None:
+        try:
+            self.frames.get_nowait()  # Drop the frame that was not processed in time
+        except queue.Empty:
+            pass
+        self.frames.put(frame)
+
     def process_frame(self) -> bool:
         """Process a single video frame."""
-        if not self.processing or not self.cap or not self.cap.isOpened():
+        if not self.processing:
             return False
 
-        ret, frame = self.cap.read()
-        if not ret:
+        frame = self.frames.get()
+        if frame is None:
             return False
 
         import utils
 
-        frame = utils.flip_image(frame)
+        frame = utils.flip_image(frame, in_place=True)
         output_img, time_passed = process_frame(frame)
         cv2.imshow(self.display_window_name, output_img)
 
@@ -142,6 +175,11 @@ class VideoProcessor:
     def stop_processing(self) -> None:
         """Stop processing and release resources."""
         self.processing = False
+        if self.capture_thread:
+            # The capture loop ends after at most one more read. Wait for it, so the camera is not released during a
+            # read.
+            self.capture_thread.join()
+            self.capture_thread = None
 
         if self.cap:
             self.cap.release()
@@ -158,8 +196,28 @@ def main() -> None:
     parser.add_argument("--midi-port", type=str, required=True, help="MIDI port name to use")
     parser.add_argument("--osc-port", type=int, default=9876, help="OSC port to use")
     parser.add_argument("--osc-ip", type=str, default="127.0.0.1", help="OSC IP address to use")
+    parser.add_argument(
+        "--tracking-scale",
+        type=track_hands.parse_tracking_scale,
+        default=1.0,
+        help="Downscale frames by this factor in (0, 1] before hand tracking",
+    )
+    parser.add_argument(
+        "--model-complexity",
+        type=int,
+        choices=[0, 1],
+        default=1,
+        help="MediaPipe hand landmark model: 0 = lite, 1 = full",
+    )
 
     args = parser.parse_args()
+    track_hands.tracking_scale = args.tracking_scale
+    if args.model_complexity != 1:
+        track_hands.set_model_complexity(args.model_complexity)
+
+    # The per-frame OpenCV work (color conversion, flipping, drawing) is too small to gain from OpenCV's thread pool,
+    # which would only compete with the capture thread and MediaPipe's own inference threads
+    cv2.setNumThreads(1)
 
     midi_processor = MidiProcessor(port_name=args.midi_port)
     if not midi_processor.input_port_available():
@@ -1,17 +1,122 @@
 """Module to send OSC messages to a specified port."""
 
-from pythonosc.udp_client import SimpleUDPClient
+import functools
+import socket
+import struct
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 
-_state = {"osc_port": 0, "osc_client": None}
+import numpy as np
+import numpy.typing as npt
+
+# Set by configure(). The socket's bound sendto is kept in a module global so sending costs one global lookup.
+_osc_socket: socket.socket | None = None
+_osc_address: tuple = ("127.0.0.1", 0)
+_sendto: Callable[[bytes, tuple], int] | None = None
+_pending = threading.local()  # Messages collected by bundle() for the current thread
+
+_BUNDLE_HEADER = b"#bundle\0" + struct.pack(">Q", 1)  # Time tag 1 means "immediately"
+_INT32_MIN, _INT32_MAX = -(2**31), 2**31 - 1
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
 
 
 def configure(ip_addr: str, port: int) -> None:
-    _state["osc_port"] = port
-    _state["osc_client"] = SimpleUDPClient(ip_addr, _state["osc_port"])
+    global _osc_socket, _osc_address, _sendto
+    try:
+        family, _, _, _, address = socket.getaddrinfo(ip_addr, port, type=socket.SOCK_DGRAM)[0]
+    except socket.gaierror as e:
+        raise ValueError(f"Cannot resolve OSC target {ip_addr}:{port}: {e}") from e
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    if _osc_socket is not None:
+        _osc_socket.close()
+    _osc_address = address
+    _osc_socket = sock
+    _sendto = sock.sendto
+
+
+@functools.lru_cache(maxsize=256)
+def _encode_string(text: str) -> bytes:
+    """Encode an OSC string: null-terminated and padded to a multiple of 4 bytes. Cached, as addresses repeat."""
+    data = text.encode()
+    return data + b"\0" * (4 - len(data) % 4)
+
+
+def _encode_message(address: str, args: tuple[object, ...]) -> bytes:
+    type_tags = ","
+    payload = []
+    for arg in args:
+        if isinstance(arg, str):
+            type_tags += "s"
+            payload.append(_encode_string(arg))
+        elif isinstance(arg, (bool, np.bool_)):  # Before int, as bool is a subclass of int
+            type_tags += "T" if arg else "F"
+        elif isinstance(arg, (int, np.integer)):
+            if _INT32_MIN <= arg <= _INT32_MAX:
+                type_tags += "i"
+                payload.append(struct.pack(">i", arg))
+            elif _INT64_MIN <= arg <= _INT64_MAX:
+                type_tags += "h"
+                payload.append(struct.pack(">q", arg))
+            else:
+                raise ValueError(f"OSC integer argument out of 64 bit range: {arg}")
+        elif isinstance(arg, (float, np.floating)):
+            type_tags += "f"
+            payload.append(struct.pack(">f", arg))
+        elif isinstance(arg, bytes):
+            type_tags += "b"
+            payload.append(struct.pack(">i", len(arg)) + arg + b"\0" * (-len(arg) % 4))
+        elif arg is None:
+            type_tags += "N"
+        else:
+            raise TypeError(
+                f"Unsupported OSC argument type for {address}: {type(arg).__name__} "
+                "(supported: str, bool, int, float, bytes, None)"
+            )
+    return _encode_string(address) + _encode_string(type_tags) + b"".join(payload)
 
 
 def send_message(address: str, *args: object) -> None:
-    _state["osc_client"].send_message(address, args)
+    _send(_encode_message(address, args))
+
+
+def send_floats(address: str, values: npt.ArrayLike) -> None:
+    """Send a message with one float argument per value. The values are packed in one conversion, which is much
+    faster than passing them one by one to send_message()."""
+    data = np.asarray(values, dtype=">f4").ravel()
+    _send(_encode_string(address) + _encode_string("," + "f" * data.size) + data.tobytes())
+
+
+def _send(dgram: bytes) -> None:
+    messages = getattr(_pending, "messages", None)
+    if messages is not None:
+        messages.append(dgram)
+    else:
+        _send_datagram(dgram)
+
+
+def _send_datagram(dgram: bytes) -> None:
+    if _sendto is None:
+        raise RuntimeError("OSC sender is not configured, call osc_sender.configure() first")
+    _sendto(dgram, _osc_address)
+
+
+@contextmanager
+def bundle() -> Iterator[None]:
+    """Collect all messages sent by this thread within the block and send them as a single OSC bundle."""
+    if getattr(_pending, "messages", None) is not None:  # Already inside a bundle
+        yield
+        return
+
+    _pending.messages = []
+    try:
+        yield
+    finally:
+        messages, _pending.messages = _pending.messages, None
+        if messages:
+            dgram = _BUNDLE_HEADER + b"".join(struct.pack(">i", len(msg)) + msg for msg in messages)
+            _send_datagram(dgram)
 
 
 configure("127.0.0.1", 9876)  # Default IP and port
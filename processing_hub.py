@@ -8,7 +8,6 @@ import time
 
 import mido
 import numpy as np
-from shapely.geometry import Point, Polygon
 
 import draw_keys_3d
 import osc_sender
@@ -17,6 +16,18 @@ import track_hands
 import utils
 from datatypes import HandLiteral, Image, MidiResult, TrackingResult
 
+# Indexes of finger tips in the landmarks (thumb to pinky)
+_FINGER_TIPS_IDX = np.array(
+    [
+        track_hands.MP_THUMB_TIP,
+        track_hands.MP_INDEX_FINGER_TIP,
+        track_hands.MP_MIDDLE_FINGER_TIP,
+        track_hands.MP_RING_FINGER_TIP,
+        track_hands.MP_PINKY_TIP,
+    ],
+    dtype=np.intp,
+)
+
 
 class ProcessingHub:
     """Coordinates analysis results between modules."""
@@ -44,11 +55,9 @@ class ProcessingHub:
         # Return which one is closer to the outline
         left_x, right_x = float("-inf"), float("inf")
         if self.last_mp_result.left_visible:
-            left_x_coords = self.last_mp_result.left_landmarks_xyz[0]
-            left_x = max(left_x_coords) * track_hands.image_width_px
+            left_x = self.last_mp_result.left_landmarks_xyz[:, 0].max() * track_hands.image_width_px
         if self.last_mp_result.right_visible:
-            right_x_coords = self.last_mp_result.right_landmarks_xyz[0]
-            right_x = min(right_x_coords) * track_hands.image_width_px
+            right_x = self.last_mp_result.right_landmarks_xyz[:, 0].min() * track_hands.image_width_px
 
         if not self.last_mp_result.left_visible and not self.last_mp_result.right_visible:
             return "", []
@@ -67,56 +76,37 @@ class ProcessingHub:
             landmarks = self.last_mp_result.left_landmarks_xyz
         else:
             landmarks = self.last_mp_result.right_landmarks_xyz
-        finger_tips_idx = [
-            track_hands.MP_THUMB_TIP,
-            track_hands.MP_INDEX_FINGER_TIP,
-            track_hands.MP_MIDDLE_FINGER_TIP,
-            track_hands.MP_RING_FINGER_TIP,
-            track_hands.MP_PINKY_TIP,
-        ]  # Indexes of finger tips in the landmarks
-        result_fingers: list[int] = []
-        closest_finger = None
-        min_distance = float("inf")
-
-        for tip_idx, tip in enumerate(finger_tips_idx):
-            x = landmarks[0][tip] * track_hands.image_width_px
-            y = landmarks[1][tip] * track_hands.image_height_px
-            point = (x, y)
-            distance = _point_distance_to_quad(point, outline)
-
-            # Keep track of the closest finger regardless of whether it's inside or outside
-            if distance < min_distance:
-                min_distance = distance
-                closest_finger = tip_idx + 1
-
-            # If the finger is inside the key area (distance < 0), add it to the list
-            if distance < 0:
-                result_fingers.append(tip_idx + 1)
-
-        # If no fingers are inside the key area, use the closest one
-        if not result_fingers and closest_finger is not None:
-            result_fingers = [closest_finger]
+        tips = landmarks[_FINGER_TIPS_IDX, :2] * (track_hands.image_width_px, track_hands.image_height_px)
+        distances = _points_distance_to_quad(tips, outline)
+
+        # Fingers inside the key area (distance < 0); if there are none, use the closest one
+        result_fingers: list[int] = (np.flatnonzero(distances < 0) + 1).tolist()
+        if not result_fingers:
+            result_fingers = [int(np.argmin(distances)) + 1]
 
         return result_hand, result_fingers
 
     def draw_results(self, img: Image) -> None:
         """Draw analysis results on the image."""
         # Draw notes
+        keys: list[tuple[int, tuple[int, int, int], str]] = []
         for midi_pitch, note_props in self.current_notes.items():
-            if note_props["hand"] == "left":
+            hand = note_props["hand"]
+            if hand == "left":
                 color = (0, 0, 200)  # Red color
-            elif note_props["hand"] == "right":
+            elif hand == "right":
                 color = (0, 200, 0)  # Green color
             else:
                 color = (200, 200, 0)  # Yellow for unknown hand
 
-            annotation = f"{', '.join(str(x) for x in note_props['fingers'])}"
-            img = draw_keys_3d.draw_key(img, midi_pitch, color, annotation)
+            annotation = ", ".join(map(str, note_props["fingers"]))
+            keys.append((midi_pitch, color, annotation))
+        draw_keys_3d.draw_keys(img, keys)
 
         draw_keys_3d.draw_keyboard(img, (0, 165, 255), outline_only=True)  # Orange color in BGR format
 
     def process_midi_event(self, timestamp: float, msg: mido.Message) -> None:
-        with self._lock:
+        with self._lock, osc_sender.bundle():
             if msg.type == "note_on" and msg.velocity > 0:
                 hand, fingers = self._closest_hand_and_fingers(msg.note)
                 midi_result: MidiResult = {
@@ -147,22 +137,25 @@ class ProcessingHub:
                 self.send_note_off_osc(msg.note, hand, fingers)
 
     def send_note_on_osc(self, midi_pitch: int, velocity: int, hand: str, fingers: list[int]) -> None:
-        osc_sender.send_message(f"/note", midi_pitch, velocity)
+        osc_sender.send_message("/note", midi_pitch, velocity)
         osc_sender.send_message(f"/{hand}/note", midi_pitch, velocity)
         for finger in fingers:
             osc_sender.send_message(f"/{hand}/{finger}/note", midi_pitch, velocity)
 
     def send_note_off_osc(self, midi_pitch: int, hand: str, fingers: list[int]) -> None:
         velocity = 0
-        osc_sender.send_message(f"/note", midi_pitch, velocity)
+        osc_sender.send_message("/note", midi_pitch, velocity)
         osc_sender.send_message(f"/{hand}/note", midi_pitch, velocity)
         for finger in fingers:
             osc_sender.send_message(f"/{hand}/{finger}/note", midi_pitch, velocity)
 
     def process_frame(self, timestamp: float, img: Image) -> None:
         start_time = time.perf_counter()
-        with self._lock:
-            self.last_image_output = img.copy()
+        with self._lock, osc_sender.bundle():
+            # Reuse the output buffer of the previous frame if the frame size did not change
+            if self.last_image_output is None or self.last_image_output.shape != img.shape:
+                self.last_image_output = np.empty_like(img)
+            np.copyto(self.last_image_output, img)
             self.last_mp_result = track_hands.analyze_frame(img_input=img, img_output=self.last_image_output)
             assert self.last_mp_result is not None
             for pitch, note_properties in self.current_notes.items():
@@ -172,30 +165,40 @@ class ProcessingHub:
                     self.last_mp_result,
                     img_output=self.last_image_output,
                 )
-                osc_sender.send_message(f"/touch/uv", hand, finger, pitch, u, v)
+                osc_sender.send_message("/touch/uv", hand, finger, pitch, u, v)
             self.draw_results(self.last_image_output)
         elapsed = time.perf_counter() - start_time
         utils.add_text_to_image(self.last_image_output, f"Achievable FPS = {1.0/elapsed:.1f}")
 
 
-def _point_distance_to_quad(point: tuple[float, float], quad: Image) -> float:
+def _points_distance_to_quad(points: Image, quad: Image) -> Image:
     """
-    point: tuple (x, y)
-    quad: numpy array with shape (4, 1, 2)
-    Returns a negative value (= how much it is inside), if the point is inside the polygon, otherwise the minimum
-    distance to the polygon.
+    points: numpy array with shape (n, 2)
+    quad: numpy array with shape (m, 1, 2), the outline of a key (4 or 8 corners)
+    Returns a numpy array with shape (n,). For each point a negative value (= how much it is inside), if the point
+    is inside the polygon, otherwise the minimum distance to the polygon.
     """
-    # Convert quad to shape (4,2)
-    quad_points = quad[:, 0, :]
-    polygon = Polygon(quad_points)
-    pt = Point(point)
-    if polygon.contains(pt):
-        # Return negative value: how far the point is inside
-        # Calculate the distance to the nearest edge and return it as negative
-        nearest_point = polygon.boundary.interpolate(polygon.boundary.project(pt))
-        return -pt.distance(nearest_point)
-    else:
-        return pt.distance(polygon)
+    pts = np.asarray(points, dtype=np.float64)[:, None, :]  # (n, 1, 2)
+    ends = quad[:, 0, :].astype(np.float64)  # (m, 2)
+    starts = np.roll(ends, 1, axis=0)
+    edges = ends - starts
+
+    # Distance to the closest point on each edge, then the minimum over all edges
+    rel = pts - starts  # (n, m, 2)
+    len_sq = (edges * edges).sum(axis=1)
+    t = np.clip((rel * edges).sum(axis=2) / np.where(len_sq > 0, len_sq, 1.0), 0.0, 1.0)  # (n, m)
+    diff = rel - t[:, :, None] * edges
+    distance = np.sqrt((diff * diff).sum(axis=2).min(axis=1))
+
+    # Even-odd rule: count crossings of a horizontal ray from each point to the right
+    px, py = pts[:, :, 0], pts[:, :, 1]  # (n, 1)
+    sy, ey = starts[:, 1], ends[:, 1]
+    crosses = (sy > py) != (ey > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = starts[:, 0] + (py - sy) * (ends[:, 0] - starts[:, 0]) / (ey - sy)
+    inside = np.count_nonzero(crosses & (px < x_cross), axis=1) % 2 == 1
+
+    return np.where(inside, -distance, distance)
 
 
 hub = ProcessingHub()
@@ -7,17 +7,23 @@ import os
 
 import cv2
 import mido
+import numpy as np
 
 import draw_keys_3d
 import keyboard_geometry
 import osc_sender
+import track_hands
 import utils
 from datatypes import Image
 from processing_hub import hub
 
 
 def parse_midi_msgs(filename: str) -> list[dict]:
-    """Parse MIDI messages from file. Returns empty list if file doesn't exist."""
+    """Parse MIDI messages from file. Returns empty list if file doesn't exist.
+
+    Only the timestamps are parsed here. The message text is converted to a mido.Message when the event is
+    processed (see process_midi), so startup does not have to parse messages that are never played back.
+    """
     result = []
     try:
         with open(filename, "r", encoding="utf-8") as file:
@@ -25,8 +31,7 @@ def parse_midi_msgs(filename: str) -> list[dict]:
                 try:
                     timestamp, msg_text = line.strip().split(": ", 1)
                     timestamp = float(timestamp)
-                    msg = mido.Message.from_str(msg_text)
-                    result.append({"timestamp": timestamp, "type": "midi", "message": msg})
+                    result.append({"timestamp": timestamp, "type": "midi", "message_text": msg_text})
                 except ValueError as e:
                     print(f"Error parsing line: {line} -> {e}")
     except FileNotFoundError:
@@ -63,10 +68,15 @@ def parse_video(path: str) -> list[dict]:
     return parse_video_timestamps(timestamps_file)
 
 
+verbose = False  # Print every processed event (set with --verbose)
+
+SKIP_DISPLAY_INTERVAL = 10  # Show every n-th frame while skipping to the next note or to the end
+
 skip_to_next_note = {
     "should_skip_to_next_note": False,
     "note_received": False,
     "should_skip_to_end": False,
+    "frames_not_shown": 0,
 }
 
 
@@ -93,6 +103,7 @@ def handle_keyboard_input(img: Image) -> None:
                     "should_skip_to_next_note": True,
                     "note_received": False,
                     "should_skip_to_end": False,
+                    "frames_not_shown": 0,
                 }
                 break
             elif key == ord("e"):
@@ -103,8 +114,12 @@ def handle_keyboard_input(img: Image) -> None:
                 cv2.destroyAllWindows()
                 exit(0)
     else:
-        cv2.imshow("Simulate Recording", img)
-        cv2.waitKey(1)  # Just to update the window without blocking
+        # While skipping ahead, only refresh the window for every n-th frame
+        skip_to_next_note["frames_not_shown"] += 1
+        if skip_to_next_note["frames_not_shown"] >= SKIP_DISPLAY_INTERVAL:
+            skip_to_next_note["frames_not_shown"] = 0
+            cv2.imshow("Simulate Recording", img)
+            cv2.waitKey(1)  # Just to update the window without blocking
 
 
 def get_all_events(recording_base: str) -> list[dict]:
@@ -119,38 +134,95 @@ def get_all_events(recording_base: str) -> list[dict]:
 
 
 def process_midi(event: dict) -> None:
-    print(f"{event['timestamp']}: {event['message']}")
-    hub.process_midi_event(event["timestamp"], event["message"])
+    try:
+        msg = mido.Message.from_str(event["message_text"])
+    except ValueError as e:
+        print(f"Error parsing MIDI message: {event['message_text']} -> {e}")
+        return
+    if verbose:
+        print(f"{event['timestamp']}: {msg}")
+    hub.process_midi_event(event["timestamp"], msg)
     res = hub.last_midi_result
     assert res
-    if res["type"] == "note_on":
+    if verbose and res["type"] == "note_on":
         print(res["hand"].capitalize(), res["fingers"])
     if skip_to_next_note["should_skip_to_next_note"]:
         skip_to_next_note["note_received"] = True
 
 
 class VideoPlayer:
-    """Class to handle video playback."""
+    """Class to handle video playback.
+
+    Frames are read sequentially. Frames between two requested frame numbers are only grabbed (decoded but
+    not converted/retrieved), and the capture is only repositioned when a frame before the current position is requested.
+    Returned frames are already flipped according to the camera orientation settings.
+    """
+
+    MAX_GRAB_AHEAD = 100  # Seek instead of grabbing if more frames than this would be skipped
 
     def __init__(self, video_path: str) -> None:
         self.video_path = video_path
         self.video_capture = None
+        self.next_frame_number = 0
+        self.preloaded_frames: Image | None = None
+        self.preloaded_slots: dict[int, int] = {}
 
     def load_video_if_needed(self) -> None:
         if self.video_capture is None:
             video_file = os.path.join(self.video_path, "video", "recording.avi")
             self.video_capture = cv2.VideoCapture(video_file)
+            self.next_frame_number = 0
+
+    def preload(self, frame_numbers: list[int]) -> None:
+        """Decode and flip the given frames once into a single contiguous (N, H, W, 3) array.
+
+        Afterwards read_frame() returns read-only views into this array for these frames without touching the
+        video file. The array is shared by all reads of a frame, so callers must not modify the returned frames
+        (copy them first if needed). Needs N * H * W * 3 bytes of memory.
+        """
+        frame_numbers = sorted(set(frame_numbers))
+        frames = None
+        slots: dict[int, int] = {}
+        for slot, frame_number in enumerate(frame_numbers):
+            ret, img = self._read_from_capture(frame_number)
+            if not ret:
+                break
+            if frames is None:
+                frames = np.empty((len(frame_numbers), *img.shape), dtype=img.dtype)
+            frames[slot] = img
+            slots[frame_number] = slot
+        if frames is not None:
+            frames.flags.writeable = False
+        self.preloaded_frames = frames
+        self.preloaded_slots = slots
 
     def read_frame(self, frame_number: int) -> tuple[bool, Image]:
+        slot = self.preloaded_slots.get(frame_number)
+        if slot is not None:
+            assert self.preloaded_frames is not None
+            return True, self.preloaded_frames[slot]
+        return self._read_from_capture(frame_number)
+
+    def _read_from_capture(self, frame_number: int) -> tuple[bool, Image]:
         self.load_video_if_needed()
         assert self.video_capture is not None, "Video capture is not initialized"
-        self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        skip = frame_number - self.next_frame_number
+        if skip < 0 or skip > self.MAX_GRAB_AHEAD:
+            self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        else:
+            for _ in range(skip):
+                if not self.video_capture.grab():
+                    break
         ret, img = self.video_capture.read()
+        self.next_frame_number = frame_number + 1
+        if ret:
+            img = utils.flip_image(img, in_place=True)  # Freshly decoded, so it is safe to flip in place
         return ret, img
 
 
 def process_video_frame(event: dict, video_processor: VideoPlayer) -> None:
-    print(f"{event['timestamp']:.7f}: Frame {event['frame_number']}")
+    if verbose:
+        print(f"{event['timestamp']:.7f}: Frame {event['frame_number']}")
 
     # Read frame
     ret, img = video_processor.read_frame(event["frame_number"])
@@ -158,9 +230,6 @@ def process_video_frame(event: dict, video_processor: VideoPlayer) -> None:
         print(f"Failed to read frame {event['frame_number']}")
         return
 
-    # Process frame
-    img = utils.flip_image(img)
-
     # Time the frame processing
     # start_time = time.time()
     hub.process_frame(event["timestamp"], img)
@@ -186,8 +255,37 @@ def main():
         default="./recording",
         help="Path of the recording",
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print every processed MIDI and video event",
+    )
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        help="Decode all video frames into memory before playback",
+    )
+    parser.add_argument(
+        "--tracking-scale",
+        type=track_hands.parse_tracking_scale,
+        default=1.0,
+        help="Downscale frames by this factor in (0, 1] before hand tracking (default: 1.0)",
+    )
+    parser.add_argument(
+        "--model-complexity",
+        type=int,
+        choices=[0, 1],
+        default=1,
+        help="MediaPipe hand landmark model: 0 = lite, 1 = full (default: 1)",
+    )
     args = parser.parse_args()
 
+    global verbose
+    verbose = args.verbose
+    track_hands.tracking_scale = args.tracking_scale
+    if args.model_complexity != 1:
+        track_hands.set_model_complexity(args.model_complexity)
+
     if os.path.exists(os.path.join(args.recording, "calibration")):
         utils.set_calibration_base_dir(args.recording)
         keyboard_geometry.black_height = keyboard_geometry.load_black_height()
@@ -198,6 +296,8 @@ def main():
 
     video_player = VideoPlayer(args.recording)
     all_events = get_all_events(args.recording)
+    if args.preload:
+        video_player.preload([event["frame_number"] for event in all_events if event["type"] == "video"])
     # start_real = time.time()
     # start_recording = all_events[0]["timestamp"]
     for event in all_events:
@@ -1,6 +1,6 @@
 """Functions to find fingertip position on a piano key and convert to trapezoid coordinates."""
 
-import os
+import math
 
 import cv2
 import numpy as np
@@ -27,12 +27,10 @@ def find_tip_on_key(
         return float("nan"), float("nan"), "", -1
 
     tip_idx = track_hands.finger_to_tip_index[fingers[0]]
-    if hand == "left":
-        x_tip = mp_result.left_landmarks_xyz[0][tip_idx] * track_hands.image_width_px
-        y_tip = mp_result.left_landmarks_xyz[1][tip_idx] * track_hands.image_height_px
-    else:
-        x_tip = mp_result.right_landmarks_xyz[0][tip_idx] * track_hands.image_width_px
-        y_tip = mp_result.right_landmarks_xyz[1][tip_idx] * track_hands.image_height_px
+    landmarks = mp_result.left_landmarks_xyz if hand == "left" else mp_result.right_landmarks_xyz
+    x_norm, y_norm = landmarks[tip_idx, :2].tolist()
+    x_tip = x_norm * track_hands.image_width_px
+    y_tip = y_norm * track_hands.image_height_px
 
     key_outline = draw_keys_3d.pixel_coordinates_of_bounding_box(midi_pitch)
     u, v = point_to_trapezoid_coords((x_tip, y_tip), key_outline)
@@ -70,25 +68,16 @@ def draw_tip_on_key(
     )
 
     u, v = tip_uv_coords
-    p0 = key_bounding_box[0, 0]  # top-left
-    p1 = key_bounding_box[1, 0]  # bottom-left
-    p3 = key_bounding_box[3, 0]  # top-right
-    p2 = key_bounding_box[2, 0]  # bottom-right
-
-    left = p0 + v * (p1 - p0)
-    right = p3 + v * (p2 - p3)
-    top = p0 + u * (p3 - p0)
-    bottom = p1 + u * (p2 - p1)
-
-    # Horizontal line
-    start_v = tuple(map(int, left))
-    end_v = tuple(map(int, right))
-    cv2.line(img, start_v, end_v, (255, 0, 0), 1)
-
-    # Vertical line
-    start_h = tuple(map(int, top))
-    end_h = tuple(map(int, bottom))
-    cv2.line(img, start_h, end_h, (255, 0, 0), 1)
+    p0, p1, p2, p3 = key_bounding_box[:, 0]  # top-left, bottom-left, bottom-right, top-right
+
+    # Horizontal and vertical line through the tip, drawn with a single polylines call
+    lines = np.array(
+        [
+            [p0 + v * (p1 - p0), p3 + v * (p2 - p3)],  # left to right
+            [p0 + u * (p3 - p0), p1 + u * (p2 - p1)],  # top to bottom
+        ]
+    ).astype(np.int32)
+    cv2.polylines(img, list(lines), False, (255, 0, 0), 1)
 
     # Display text with coordinates
     if show_text:
@@ -121,60 +110,48 @@ def point_to_trapezoid_coords(point: tuple[float, float], trapezoid: Image) -> t
         - u=0 is the left side, u=1 is the right side
         - v=0 is the top side, v=1 is the bottom side
     """
-    assert trapezoid.shape == (4, 1, 2)
-    p0: float = trapezoid[0, 0]  # top-left
-    p3: float = trapezoid[1, 0]  # bottom-left
-    p2: float = trapezoid[2, 0]  # bottom-right
-    p1: float = trapezoid[3, 0]  # top-right
-
-    # Iterative approximation of bilinear coordinates
-    # Start value in the middle
-    u, v = 0.5, 0.5
-    max_iterations = 10
-    tolerance = 1e-6
-
-    for _ in range(max_iterations):
-        # Calculate point at current (u,v)
-        top = p0 + u * (p1 - p0)  # Point on top edge
-        bottom = p3 + u * (p2 - p3)  # Point on bottom edge
-        computed_point = top + v * (bottom - top)
-
-        # Check if we are close enough to the target point
-        np_point = np.array(point, dtype=np.float32)
-        error = np.linalg.norm(computed_point - np_point)
-        if error < tolerance:
-            break
-
-        # Otherwise update u and v
-        # Calculate derivatives with respect to u and v
-        du_vector = (1 - v) * (p1 - p0) + v * (p2 - p3)
-        dv_vector = bottom - top
-
-        # Create Jacobian matrix
-        jacobian = np.column_stack([du_vector, dv_vector])
-
-        # Calculate adjustment for u and v
-        try:
-            delta = np.linalg.solve(jacobian, np_point - computed_point)
-            u += delta[0]
-            v += delta[1]
-        except np.linalg.LinAlgError:
-            # If matrix is singular, exit early
-            break
-
-    return u, v
+    # Corners in the order top-left, bottom-left, bottom-right, top-right
+    (x0, y0), (x3, y3), (x2, y2), (x1, y1) = trapezoid.reshape(4, 2).tolist()
+
+    # The bilinear map is P(u,v) = p0 + u*e + v*f + u*v*g
+    ex, ey = x1 - x0, y1 - y0  # Top edge
+    fx, fy = x3 - x0, y3 - y0  # Left edge
+    gx, gy = x0 - x1 + x2 - x3, y0 - y1 + y2 - y3
+    qx, qy = point[0] - x0, point[1] - y0
+
+    # Taking the cross product of q = u*(e + v*g) + v*f with (e + v*g) eliminates u: a*v^2 + b*v + c = 0
+    a = fx * gy - fy * gx
+    b = (fx * ey - fy * ex) - (qx * gy - qy * gx)
+    c = ex * qy - ey * qx
+
+    # Numerically stable roots, which also covers a == 0 (parallelogram)
+    t = -0.5 * (b + math.copysign(math.sqrt(max(b * b - 4.0 * a * c, 0.0)), b))
+    v_candidates = []
+    if a != 0.0:
+        v_candidates.append(t / a)
+    if t != 0.0:
+        v_candidates.append(c / t)
+
+    # Of the (up to two) solutions, take the one closest to the key
+    best_u, best_v = float("nan"), float("nan")
+    best_dist = float("inf")
+    for v in v_candidates:
+        dx, dy = ex + v * gx, ey + v * gy
+        len_sq = dx * dx + dy * dy
+        if len_sq == 0.0:
+            continue
+        u = ((qx - v * fx) * dx + (qy - v * fy) * dy) / len_sq
+        dist = max(abs(u - 0.5), abs(v - 0.5))
+        if dist < best_dist:
+            best_u, best_v, best_dist = u, v, dist
+
+    return best_u, best_v
 
 
 def test_interactive() -> None:
     """Interactive test with mouse clicks."""
     # Load image
-    img_path = utils.get_keyboard_image_file_path()
-    img = None
-    if os.path.exists(img_path):
-        img = cv2.imread(img_path)
-    if img is None:
-        img = np.full((1080, 1920, 3), 255, dtype=np.uint8)
-    img = utils.flip_image(img)
+    img = utils.load_keyboard_image()
 
     # Draw key (e.g. C4 = MIDI 60)
     midi_pitch = 60
@@ -198,10 +175,6 @@ def test_interactive() -> None:
     pts = np.int32(key_outline).reshape((-1, 1, 2))
     cv2.polylines(img, [pts], True, (0, 255, 0), 2)
     cv2.imshow("Test Trapezoid Coordinates", img)
-    key_outline = draw_keys_3d.pixel_coordinates_of_bounding_box(midi_pitch)
-    key_outline_pts = np.int32(key_outline).reshape((-1, 1, 2))
-    cv2.polylines(img, [key_outline_pts], True, (0, 255, 0), 2)
-    cv2.imshow("Test Trapezoid Coordinates", img)
 
     print("Click on the key to see trapezoid coordinates. Press 'q' to quit.")
     while True:
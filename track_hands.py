@@ -1,7 +1,10 @@
 """Functions to track hands using Google's MediaPipe."""
 
+import argparse
+
 import cv2
 import mediapipe as mp
+import numpy as np
 
 import osc_sender
 from datatypes import Image, TrackingResult
@@ -20,19 +23,53 @@ finger_to_tip_index = {
     5: MP_PINKY_TIP,
 }
 
+# OSC addresses of the visibility and landmarks messages of each hand
+_VISIBLE_ADDRESSES = {"left": "/left/visible", "right": "/right/visible"}
+_LANDMARKS_ADDRESSES = {"left": "/left/landmarks", "right": "/right/landmarks"}
+
+# Pairs of landmark indices connected when drawing a hand, shape (n, 2)
+_HAND_CONNECTIONS = np.array(sorted(mp.solutions.hands.HAND_CONNECTIONS), dtype=np.intp)
+
+# Colors for drawing the landmarks of each hand
+_LANDMARK_COLORS = {"left": (0, 0, 200), "right": (0, 200, 0)}
+
 image_width_px = 0
 image_height_px = 0
 
+# Scale factor applied to frames before hand tracking. Values below 1.0 make tracking faster but less precise. The
+# landmarks are normalized, so image_width_px and image_height_px always refer to the original frame.
+tracking_scale = 1.0
+
+
+def parse_tracking_scale(text: str) -> float:
+    """argparse type for --tracking-scale: a downscale factor in (0, 1]."""
+    try:
+        scale = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {text!r}") from None
+    if not 0.0 < scale <= 1.0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0 and at most 1, got {text}")
+    return scale
+
+
+_rgb_frame: Image | None = None  # Reused for the RGB copy of each frame, reallocated when the frame size changes
+
 
 def analyze_frame(img_input: Image, img_output: Image | None = None) -> TrackingResult:
     """Analyze a video frame to detect and track hands."""
-    global image_width_px, image_height_px
+    global image_width_px, image_height_px, _rgb_frame
     image_height_px, image_width_px = img_input.shape[:2]
-    # Convert the frame to RGB (MediaPipe expects RGB images)
-    rgb_frame = cv2.cvtColor(img_input, cv2.COLOR_BGR2RGB)
+    # Convert the frame to RGB (MediaPipe expects RGB images). MediaPipe copies the image into its own packet, so
+    # the buffer can be overwritten by the next frame.
+    tracking_input = img_input
+    if tracking_scale != 1.0:
+        tracking_input = cv2.resize(img_input, None, fx=tracking_scale, fy=tracking_scale, interpolation=cv2.INTER_AREA)
+    if _rgb_frame is None or _rgb_frame.shape != tracking_input.shape:
+        _rgb_frame = np.empty_like(tracking_input)
+    cv2.cvtColor(tracking_input, cv2.COLOR_BGR2RGB, dst=_rgb_frame)
 
     # Process the frame and get results
-    mp_results = _hands_tracker.process(rgb_frame)
+    mp_results = _hands_tracker.process(_rgb_frame)
 
     result = TrackingResult()
     if mp_results.multi_hand_landmarks:
@@ -43,45 +80,24 @@ def analyze_frame(img_input: Image, img_output: Image | None = None) -> Tracking
                 label = "right"
             elif label.lower() == "right":
                 label = "left"
-            osc_sender.send_message(f"/{label}/visible", 1)
+            osc_sender.send_message(_VISIBLE_ADDRESSES[label], 1)
 
-            x_coords = [landmark.x for landmark in hand_landmarks.landmark]
-            y_coords = [landmark.y for landmark in hand_landmarks.landmark]
-            z_coords = [landmark.z for landmark in hand_landmarks.landmark]
+            landmarks_xyz = np.array(
+                [(landmark.x, landmark.y, landmark.z) for landmark in hand_landmarks.landmark], dtype=np.float32
+            )
 
             if label == "left":
                 result.left_visible = True
-                result.left_landmarks_xyz = (x_coords, y_coords, z_coords)
+                result.left_landmarks_xyz = landmarks_xyz
 
             elif label == "right":
                 result.right_visible = True
-                result.right_landmarks_xyz = (x_coords, y_coords, z_coords)
-
-            coords = zip(x_coords, y_coords, z_coords)
-            flat_coords = []
-            for x, y, z in coords:
-                flat_coords.append(x)
-                flat_coords.append(y)
-                flat_coords.append(z)
+                result.right_landmarks_xyz = landmarks_xyz
 
-            if label == "left":
-                mp.solutions.drawing_utils.draw_landmarks(
-                    img_output,
-                    hand_landmarks,
-                    mp.solutions.hands.HAND_CONNECTIONS,
-                    mp.solutions.drawing_utils.DrawingSpec(color=(0, 0, 200), thickness=2, circle_radius=2),
-                    mp.solutions.drawing_utils.DrawingSpec(color=(255, 255, 255), thickness=2),
-                )
-            elif label == "right":
-                mp.solutions.drawing_utils.draw_landmarks(
-                    img_output,
-                    hand_landmarks,
-                    mp.solutions.hands.HAND_CONNECTIONS,
-                    mp.solutions.drawing_utils.DrawingSpec(color=(0, 200, 0), thickness=2, circle_radius=2),
-                    mp.solutions.drawing_utils.DrawingSpec(color=(255, 255, 255), thickness=2),
-                )
+            if img_output is not None and label in _LANDMARK_COLORS:
+                _draw_hand(img_output, landmarks_xyz, _LANDMARK_COLORS[label])
 
-            osc_sender.send_message(f"/{label}/landmarks", *flat_coords)
+            osc_sender.send_floats(_LANDMARKS_ADDRESSES[label], landmarks_xyz)
 
     if not result.left_visible:
         osc_sender.send_message("/left/visible", 0)
@@ -91,7 +107,40 @@ def analyze_frame(img_input: Image, img_output: Image | None = None) -> Tracking
     return result
 
 
-_hands_tracker = mp.solutions.hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.5)
+def _draw_hand(img: Image, landmarks_xyz: Image, color: tuple[int, int, int]) -> None:
+    """Draw the landmarks of a hand and their connections.
+
+    Looks the same as mp.solutions.drawing_utils.draw_landmarks() with circle radius 2 and thickness 2, but
+    draws all connections with one polylines call instead of one cv2.line call per connection.
+    """
+    height, width = img.shape[:2]
+    xy = landmarks_xyz[:, :2].astype(np.float64)
+    visible = ((xy >= 0.0) & (xy <= 1.0)).all(axis=1)  # Landmarks outside of the image are not drawn
+    points = np.minimum(np.floor(xy * (width, height)), (width - 1, height - 1)).astype(np.int32)
+
+    connections = _HAND_CONNECTIONS[visible[_HAND_CONNECTIONS].all(axis=1)]
+    if len(connections) > 0:
+        cv2.polylines(img, list(points[connections]), False, (255, 255, 255), 2)
+    for x, y in points[visible].tolist():
+        cv2.circle(img, (x, y), 3, (224, 224, 224), 2)  # Light gray border
+        cv2.circle(img, (x, y), 2, color, 2)
+
+
+def set_model_complexity(model_complexity: int) -> None:
+    """Recreate the hand tracker with MediaPipe's lite (0) or full (1) landmark model. The lite model is faster,
+    but locates the fingertips less precisely."""
+    global _hands_tracker
+    _hands_tracker.close()
+    _hands_tracker = _create_hands_tracker(model_complexity)
+
+
+def _create_hands_tracker(model_complexity: int = 1) -> mp.solutions.hands.Hands:
+    return mp.solutions.hands.Hands(
+        model_complexity=model_complexity, min_detection_confidence=0.7, min_tracking_confidence=0.5
+    )
+
+
+_hands_tracker = _create_hands_tracker()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
+import functools
 import json
 import os
 
 import cv2
+import numpy as np
 
 from datatypes import Image
 
@@ -23,6 +25,19 @@ def get_keyboard_image_file_path() -> str:
     return os.path.join(_calibration_base_dir, "calibration", "keyboard", "foto.png")
 
 
+def load_keyboard_image() -> Image:
+    """Load the keyboard image of the calibration, flipped according to the camera orientation settings.
+
+    Returns a white 1920x1080 image if there is no keyboard image. The image is freshly decoded on each call, so
+    callers may draw into it.
+    """
+    image_path = get_keyboard_image_file_path()
+    img = cv2.imread(image_path) if os.path.exists(image_path) else None
+    if img is None:
+        return np.full((1080, 1920, 3), 255, dtype=np.uint8)
+    return flip_image(img, in_place=True)
+
+
 def get_keyboard_geometry_file_path() -> str:
     return os.path.join(_calibration_base_dir, "calibration", "keyboard", "keyboard_geometry.json")
 
@@ -32,10 +47,11 @@ def retrieve_camera_orientation_file_path() -> str:
 
 
 flip_horizontal, flip_vertical = False, False
+_flip_code: int | None = None  # cv2.flip() code for the settings above, None for no flip
 
 
 def load_flip_settings() -> None:
-    global flip_vertical, flip_horizontal
+    global flip_vertical, flip_horizontal, _flip_code
     json_path = os.path.join(_calibration_base_dir, "calibration", "camera_orientation.json")
     if os.path.exists(json_path):
         with open(json_path, "r") as f:
@@ -43,16 +59,42 @@ def load_flip_settings() -> None:
         flip_horizontal = orientation.get("flip_horizontal", False)
         flip_vertical = orientation.get("flip_vertical", False)
 
+    if flip_vertical and flip_horizontal:
+        _flip_code = -1
+    elif flip_vertical:
+        _flip_code = 0
+    elif flip_horizontal:
+        _flip_code = 1
+    else:
+        _flip_code = None
+
 
 load_flip_settings()
 
 
-def flip_image(img: Image) -> Image:
-    if flip_vertical:
-        img = cv2.flip(img, 0)
-    if flip_horizontal:
-        img = cv2.flip(img, 1)
-    return img
+def flip_image(img: Image, in_place: bool = False) -> Image:
+    """Flip the image according to the camera orientation settings.
+
+    Args:
+        img: The image to flip
+        in_place: Write the flipped image back into img instead of allocating a new buffer. Only use this for
+            frames that are not referenced elsewhere (e.g. freshly decoded video frames).
+
+    Returns:
+        The flipped image (img itself if no flip is configured or in_place is True)
+    """
+    if _flip_code is None:
+        return img
+    if in_place:
+        return cv2.flip(img, _flip_code, dst=img)
+    return cv2.flip(img, _flip_code)
+
+
+@functools.lru_cache(maxsize=256)
+def _text_size(text: str, font: int, font_scale: float, thickness: int) -> tuple[tuple[int, int], int]:
+    """cv2.getTextSize(), cached because the same texts (and prefixes while word wrapping) are measured every frame."""
+    (width, height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+    return (width, height), baseline
 
 
 def add_text_to_image(
@@ -105,7 +147,7 @@ def add_text_to_image(
         for word in words[1:]:
             # Check if adding this word exceeds the max width
             test_line = current_line + " " + word
-            test_size = cv2.getTextSize(test_line, font, font_scale, thickness)[0]
+            test_size = _text_size(test_line, font, font_scale, thickness)[0]
 
             if test_size[0] <= max_text_width:
                 current_line = test_line
@@ -116,7 +158,7 @@ def add_text_to_image(
         final_text_lines.append(current_line)
 
     # Calculate text block dimensions
-    text_sizes = [cv2.getTextSize(line, font, font_scale, thickness) for line in final_text_lines]
+    text_sizes = [_text_size(line, font, font_scale, thickness) for line in final_text_lines]
     text_widths = [size[0][0] for size in text_sizes]
     text_heights = [size[0][1] for size in text_sizes]
 